@@ -1,8 +1,82 @@
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 import logging
 import os
 
+try:
+    import pyarrow  # noqa: F401
+    # Arrow's multithreaded C++ parser; falls back to pandas' C parser
+    _CSV_ENGINE = 'pyarrow'
+except ImportError:
+    _CSV_ENGINE = 'c'
+
+# Columns every input file must provide
+_EXPECTED = ('Product Type', 'ISN', 'Defective', 'CPU Cost', 'Network Card Cost', 'Total Cost')
+_EXPECTED_SET = frozenset(_EXPECTED)
+
+# Columns read from the input files and their parse types, anything else is skipped
+_DTYPES = {
+    'Product Type': 'string',
+    'ISN': 'string',
+    'Defective': bool,
+    'CPU Cost': np.float32,
+    'Network Card Cost': np.float32,
+    'Battery Cost': np.float32,
+    'Total Cost': np.float32
+}
+
+def _cost_values(column: pd.Series) -> np.ndarray:
+    """Float view of a cost column, non-float columns are widened to float64"""
+    values = column.to_numpy()
+    if values.dtype.kind == 'f':
+        return values
+    return column.to_numpy(dtype=np.float64, na_value=np.nan)
+
+@dataclass
+class ProductTable:
+    """
+    Columnar (one ndarray per column) view of the analysed product columns
+    
+    Tables from the loaders always have defective, total_cost and isn;
+    they are None only for from_frame tables that did not require them.
+    """
+    defective: Optional[np.ndarray]
+    total_cost: Optional[np.ndarray]
+    isn: Optional[np.ndarray]
+    battery_cost: Optional[np.ndarray] = None
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, 
+                   required: Tuple[str, ...] = ('Defective', 'Total Cost', 'ISN')) -> 'ProductTable':
+        """
+        Build a table from a DataFrame with cleaned column names
+        
+        Float cost columns keep their dtype (float32 for frames from
+        load_csv), integer ones are widened to float64.
+        
+        Args:
+            df: DataFrame with PC or notebook data
+            required: Columns that must be present, the others are None when absent
+            
+        Raises:
+            KeyError: If a required column is missing
+        """
+        def column(name, convert):
+            return convert(df[name]) if name in required or name in df.columns else None
+            
+        return cls(column('Defective', pd.Series.to_numpy), column('Total Cost', _cost_values), 
+                   column('ISN', pd.Series.to_numpy), column('Battery Cost', _cost_values))
+    
+    def select(self, mask: np.ndarray) -> 'ProductTable':
+        """Return a table with only the rows where mask is True"""
+        columns = (self.defective, self.total_cost, self.isn, self.battery_cost)
+        return ProductTable(*(None if values is None else values[mask] for values in columns))
+    
+    def __len__(self) -> int:
+        return self.defective.size
+
 class DataLoader:
     """Handles loading and initial processing of CSV files"""
     
@@ -16,15 +90,26 @@ class DataLoader:
         """
         return df.rename(columns=lambda x: x.strip())
     
-    def load_csv(self, filename: str) -> pd.DataFrame:
+    def _read_options(self, filepath: str) -> Dict[str, Any]:
+        """
+        Build usecols/dtype arguments for read_csv from the file header
+        
+        The header may carry whitespace ('Defective '), so the raw names
+        are read first and matched against _DTYPES after stripping.
+        """
+        raw_columns = pd.read_csv(filepath, nrows=0).columns
+        dtype = {col: _DTYPES[col.strip()] for col in raw_columns if col.strip() in _DTYPES}
+        return {'usecols': list(dtype), 'dtype': dtype}
+    
+    def load_csv(self, filename: str) -> ProductTable:
         """
-        Load CSV file into pandas DataFrame
+        Load CSV file into a columnar ProductTable
         
         Args:
             filename: Name of CSV file
             
         Returns:
-            DataFrame containing the CSV data
+            ProductTable holding the analysed columns of the CSV data
             
         Raises:
             FileNotFoundError: If file doesn't exist
@@ -32,8 +117,8 @@ class DataLoader:
         """
         filepath = os.path.join(self.input_dir, filename)
         try:
-            self.logger.info(f"Loading {filepath}")
-            df = pd.read_csv(filepath)
+            self.logger.info("Loading %s", filepath)
+            df = pd.read_csv(filepath, engine=_CSV_ENGINE, **self._read_options(filepath))
             
             if df.empty:
                 raise pd.errors.EmptyDataError(f"File {filepath} is empty")
@@ -42,17 +127,61 @@ class DataLoader:
             df = self._clean_column_names(df)
             
             # Validate expected columns
-            expected_columns = ['Product Type', 'ISN', 'Defective', 'CPU Cost', 
-                              'Network Card Cost', 'Total Cost']
-            missing_columns = [col for col in expected_columns if col not in df.columns]
-            
-            if missing_columns:
-                self.logger.error(f"Columns in file: {list(df.columns)}")
-                self.logger.error(f"Missing columns: {missing_columns}")
-                raise ValueError(f"Missing required columns in {filepath}: {', '.join(missing_columns)}")
+            self._validate_columns(df, filepath)
                 
-            return df
+            return ProductTable.from_frame(df)
             
         except Exception as e:
-            self.logger.error(f"Error loading {filepath}: {str(e)}")
-            raise
\ No newline at end of file
+            self.logger.error("Error loading %s: %s", filepath, e)
+            raise
+    
+    def load_csv_streaming(self, filename: str, 
+                           chunksize: int = 1_000_000) -> Iterator[ProductTable]:
+        """
+        Stream CSV file in chunks, keeping only non-defective rows
+        
+        Args:
+            filename: Name of CSV file
+            chunksize: Number of rows parsed per chunk
+            
+        Yields:
+            ProductTables containing the non-defective rows of each chunk
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            pd.errors.EmptyDataError: If file is empty
+        """
+        filepath = os.path.join(self.input_dir, filename)
+        try:
+            self.logger.info("Streaming %s in chunks of %d rows", filepath, chunksize)
+            # The pyarrow engine does not support chunksize, use the C parser
+            with pd.read_csv(filepath, chunksize=chunksize, 
+                             **self._read_options(filepath)) as reader:
+                for i, chunk in enumerate(reader):
+                    # A header-only file yields a single empty chunk
+                    if i == 0 and chunk.empty:
+                        raise pd.errors.EmptyDataError(f"File {filepath} is empty")
+                    chunk = self._clean_column_names(chunk)
+                    if i == 0:
+                        self._validate_columns(chunk, filepath)
+                    # Mask the column arrays only, no filtered copy of the whole chunk
+                    table = ProductTable.from_frame(chunk)
+                    yield table.select(~table.defective)
+                    
+        except Exception as e:
+            self.logger.error("Error loading %s: %s", filepath, e)
+            raise
+    
+    def _validate_columns(self, df: pd.DataFrame, filepath: str):
+        """
+        Check that all expected columns are present
+        
+        Raises:
+            ValueError: If any expected column is missing
+        """
+        missing_columns = _EXPECTED_SET.difference(df.columns)
+        
+        if missing_columns:
+            self.logger.debug("Columns in file: %s", list(df.columns))
+            self.logger.error("Missing columns: %s", sorted(missing_columns))
+            raise ValueError(f"Missing required columns in {filepath}: {', '.join(sorted(missing_columns))}")
\ No newline at end of file
@@ -1,103 +1,273 @@
-from typing import Dict
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 import logging
 
+try:
+    from .data_loader import ProductTable
+except ImportError:  # run as a script from src/, see main.py
+    from data_loader import ProductTable
+
+# The cached kernel reaches parity with NumPy around 10M rows on a single
+# core and only pulls ahead with several threads, so smaller arrays stay on NumPy
+_JIT_MIN_SIZE = 10_000_000
+
+def _masked_stats_numpy(cost: np.ndarray, defective: np.ndarray) -> Tuple[int, float, float, float, int]:
+    """
+    Reduce the non-defective entries of a cost array in a single call
+    
+    Args:
+        cost: Array of cost values
+        defective: Boolean array flagging defective items
+        
+    Returns:
+        Tuple of (argmax, max, min, sum, count) over the non-defective
+        entries with a finite cost, so blank cells read as NaN are skipped. 
+        argmax indexes into the full array and is -1 if no entry is valid.
+    """
+    valid_idx = np.flatnonzero(~defective & np.isfinite(cost))
+    if valid_idx.size == 0:
+        return -1, -np.inf, np.inf, 0.0, 0
+        
+    valid = cost[valid_idx]
+    i = valid.argmax()
+    return int(valid_idx[i]), valid[i], valid.min(), valid.sum(dtype=np.float64), valid.size
+
+def _load_jit_kernel() -> Callable:
+    """
+    Import the Numba kernel on demand
+    
+    Raises:
+        ImportError: If numba is not installed
+    """
+    if __package__:
+        from .numba_kernels import masked_stats
+    else:  # run as a script from src/, see main.py
+        from numba_kernels import masked_stats
+    return masked_stats
+
+def _masked_stats(cost: np.ndarray, defective: np.ndarray, 
+                  jit_kernel: Optional[Callable] = None) -> Tuple[int, float, float, float, int]:
+    """
+    Reduce the non-defective entries of a cost array
+    
+    Large arrays go through jit_kernel when one is given, everything else
+    through NumPy. See _masked_stats_numpy for the result.
+    """
+    if jit_kernel is not None and cost.size >= _JIT_MIN_SIZE:
+        return jit_kernel(cost, defective)
+    return _masked_stats_numpy(cost, defective)
+
+class _RunningStats:
+    """Running max/min/sum/count folded across batches of values"""
+    
+    def __init__(self):
+        self.max = -np.inf
+        self.min = np.inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def update(self, max_value: float, min_value: float, total: float, count: int):
+        """Fold the partial statistics of one batch into the running ones"""
+        if count == 0:
+            return
+        self.max = max(self.max, max_value)
+        self.min = min(self.min, min_value)
+        self.sum += total
+        self.count += count
+    
+    def as_dict(self, name: str) -> Dict:
+        """
+        Build the max/min/average result dictionary
+        
+        Raises:
+            ValueError: If no values were folded in
+        """
+        if self.count == 0:
+            raise ValueError("No valid (non-defective) items found")
+            
+        # max/min are input values and reported as is. str() gives the shortest
+        # decimal that round-trips the value's own type, so a float32 0.01 is
+        # reported as 0.01 rather than 0.009999999776482582
+        return {
+            f'max_{name}': float(str(self.max)),
+            f'min_{name}': float(str(self.min)),
+            f'avg_{name}': round(float(self.sum / self.count), 2)
+        }
+
+# DataFrames are accepted for convenience and converted with ProductTable.from_frame
+TableLike = Union[ProductTable, pd.DataFrame]
+
 class DataProcessor:
     """Implements business logic for data analysis"""
     
-    def __init__(self):
+    def __init__(self, use_numba: bool = False):
+        """
+        Args:
+            use_numba: Reduce very large inputs with the Numba kernel
+            
+        Raises:
+            ImportError: If use_numba is set and numba is not installed
+        """
         self.logger = logging.getLogger(__name__)
+        self._jit_kernel = _load_jit_kernel() if use_numba else None
+    
+    def _prep(self, data: TableLike, 
+              required: Tuple[str, ...] = ('Defective', 'Total Cost', 'ISN')) -> ProductTable:
+        """
+        Return data as a ProductTable, converting DataFrames with from_frame
+        
+        Args:
+            data: ProductTable or DataFrame with PC or notebook data
+            required: Columns a DataFrame must have
+            
+        Returns:
+            ProductTable; battery_cost is None if the column is absent
+        """
+        if isinstance(data, ProductTable):
+            return data
+            
+        return ProductTable.from_frame(data, required)
     
-    def get_max_cost_isn(self, pc_df: pd.DataFrame, nb_df: pd.DataFrame) -> str:
+    def get_max_cost_isn(self, pc_df: TableLike, nb_df: TableLike) -> str:
         """
-        Find ISN with maximum total cost across both dataframes
+        Find ISN with maximum total cost across both tables
         
         Args:
-            pc_df: DataFrame with PC data
-            nb_df: DataFrame with notebook data
+            pc_df: ProductTable with PC data
+            nb_df: ProductTable with notebook data
             
         Returns:
             ISN string of item with highest total cost
         """
         try:
-            # Filter out defective items
-            pc_valid = pc_df[~pc_df['Defective']]
-            nb_valid = nb_df[~nb_df['Defective']]
-
-            print(pc_valid)
-            print(nb_valid)
-            
-            # Combine and find max
-            all_items = pd.concat([pc_valid, nb_valid])
-            if all_items.empty:
+            best_cost, best_isn = -np.inf, None
+            for table in (self._prep(pc_df), self._prep(nb_df)):
+                # Same positional argmax as process_stream, blank costs are skipped
+                i, max_cost, _, _, count = _masked_stats(
+                    table.total_cost, table.defective, self._jit_kernel)
+                if count and max_cost > best_cost:
+                    best_cost, best_isn = max_cost, table.isn[i]
+                    
+            if best_isn is None:
                 raise ValueError("No valid (non-defective) items found")
                 
-            max_cost_row = all_items.loc[all_items['Total Cost'].idxmax()]
-            return max_cost_row['ISN']
+            return best_isn
             
         except Exception as e:
-            self.logger.error(f"Error in get_max_cost_isn: {str(e)}")
+            self.logger.error("Error in get_max_cost_isn: %s", e)
             raise
             
-    def calculate_cost_stats(self, pc_df: pd.DataFrame, nb_df: pd.DataFrame) -> Dict:
+    def calculate_cost_stats(self, pc_df: TableLike, nb_df: TableLike) -> Dict:
         """
-        Calculate cost statistics across both dataframes
+        Calculate cost statistics across both tables
         
         Args:
-            pc_df: DataFrame with PC data
-            nb_df: DataFrame with notebook data
+            pc_df: ProductTable with PC data
+            nb_df: ProductTable with notebook data
             
         Returns:
             Dictionary with max, min and average costs
         """
         try:
-            # Filter out defective items
-            pc_valid = pc_df[~pc_df['Defective']]
-            nb_valid = nb_df[~nb_df['Defective']]
-            
-            # Combine costs
-            all_costs = pd.concat([pc_valid['Total Cost'], nb_valid['Total Cost']])
-            
-            if all_costs.empty:
-                raise ValueError("No valid (non-defective) items found")
+            # One fused pass per table, partial results are combined as scalars
+            cost_stats = _RunningStats()
+            for table in (self._prep(pc_df), self._prep(nb_df)):
+                _, *partial = _masked_stats(table.total_cost, table.defective, self._jit_kernel)
+                cost_stats.update(*partial)
                 
-            return {
-                'max_cost': float(all_costs.max()),
-                'min_cost': float(all_costs.min()),
-                'avg_cost': round(float(all_costs.mean()), 2)
-            }
+            return cost_stats.as_dict('cost')
             
         except Exception as e:
-            self.logger.error(f"Error in calculate_cost_stats: {str(e)}")
+            self.logger.error("Error in calculate_cost_stats: %s", e)
             raise
             
-    def calculate_battery_stats(self, nb_df: pd.DataFrame) -> Dict:
+    def calculate_battery_stats(self, nb_df: TableLike) -> Dict:
         """
         Calculate battery cost statistics for notebooks
         
         Args:
-            nb_df: DataFrame with notebook data
+            nb_df: ProductTable with notebook data
             
         Returns:
             Dictionary with max, min and average battery costs
         """
         try:
-            if 'Battery Cost' not in nb_df.columns:
+            # Only Battery Cost and Defective are read, Battery Cost is checked first
+            nb = self._prep(nb_df, required=())
+            if nb.battery_cost is None:
                 raise ValueError("Battery Cost column not found in notebook data")
+            if nb.defective is None:
+                raise KeyError('Defective')
                 
-            # Filter out defective items
-            valid_items = nb_df[~nb_df['Defective']]
-            battery_costs = valid_items['Battery Cost']
+            _, *partial = _masked_stats(nb.battery_cost, nb.defective, self._jit_kernel)
+            battery_stats = _RunningStats()
+            battery_stats.update(*partial)
+            
+            return battery_stats.as_dict('battery')
+            
+        except Exception as e:
+            self.logger.error("Error in calculate_battery_stats: %s", e)
+            raise
+            
+    def compute_all(self, pc_df: TableLike, nb_df: TableLike) -> Tuple[str, Dict, Dict]:
+        """
+        Compute all results with one masked reduction per cost column
+        
+        Each table is reduced on its own and the partial results are
+        combined as scalars, so the tables are never concatenated.
+        
+        Args:
+            pc_df: ProductTable with PC data
+            nb_df: ProductTable with notebook data
+            
+        Returns:
+            Tuple of (max cost ISN, cost statistics, battery statistics)
+        """
+        return self.process_stream([pc_df], [nb_df])
+            
+    def process_stream(self, pc_chunks: Iterable[TableLike], 
+                       nb_chunks: Iterable[TableLike]) -> Tuple[str, Dict, Dict]:
+        """
+        Compute all results in a single pass over chunked data
+        
+        Only running scalars are kept between chunks, so the inputs never
+        have to fit in memory at once.
+        
+        Args:
+            pc_chunks: Iterable of ProductTables with PC data
+            nb_chunks: Iterable of ProductTables with notebook data
+            
+        Returns:
+            Tuple of (max cost ISN, cost statistics, battery statistics)
+        """
+        try:
+            best_cost, best_isn = -np.inf, None
+            cost_stats = _RunningStats()
+            battery_stats = _RunningStats()
+            
+            for is_nb, chunks in ((False, pc_chunks), (True, nb_chunks)):
+                for chunk in chunks:
+                    table = self._prep(chunk)
+                    i, max_cost, min_cost, total, count = _masked_stats(
+                        table.total_cost, table.defective, self._jit_kernel)
+                    if count and max_cost > best_cost:
+                        best_cost = max_cost
+                        best_isn = table.isn[i]
+                    cost_stats.update(max_cost, min_cost, total, count)
+                    
+                    if is_nb:
+                        if table.battery_cost is None:
+                            raise ValueError("Battery Cost column not found in notebook data")
+                        _, *battery = _masked_stats(table.battery_cost, table.defective, 
+                                                    self._jit_kernel)
+                        battery_stats.update(*battery)
             
-            if battery_costs.empty:
+            if best_isn is None:
                 raise ValueError("No valid (non-defective) items found")
                 
-            return {
-                'max_battery': float(battery_costs.max()),
-                'min_battery': float(battery_costs.min()),
-                'avg_battery': round(float(battery_costs.mean()), 2)
-            }
+            return best_isn, cost_stats.as_dict('cost'), battery_stats.as_dict('battery')
             
         except Exception as e:
-            self.logger.error(f"Error in calculate_battery_stats: {str(e)}")
+            self.logger.error("Error in process_stream: %s", e)
             raise
\ No newline at end of file
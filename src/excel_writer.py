@@ -1,8 +1,129 @@
 # excel_writer.py
 from typing import Dict
-import pandas as pd
+from xml.sax.saxutils import escape
 import logging
+import math
 import os
+import zipfile
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_DOC_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Static parts of a single-sheet workbook; only the worksheet varies per run
+_XLSX_TEMPLATE = {
+    '[Content_Types].xml': (
+        _XML_DECL +
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        _XML_DECL +
+        f'<Relationships xmlns="{_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_DOC_REL}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        _XML_DECL +
+        f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_DOC_REL}">'
+        '<sheets><sheet name="Results" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        _XML_DECL +
+        f'<Relationships xmlns="{_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_DOC_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{_DOC_REL}/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/styles.xml': (
+        _XML_DECL +
+        f'<styleSheet xmlns="{_MAIN_NS}">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+}
+
+# Fixed report layout, '{name}' entries are the per-run value slots
+_LAYOUT = (
+    ('Result1 - Max Cost ISN',),
+    ('{isn}',),
+    (),
+    ('Result2 - Cost Statistics', 'Values'),
+    ('Maximum Cost', '{max_cost}'),
+    ('Minimum Cost', '{min_cost}'),
+    ('Average Cost', '{avg_cost}'),
+    (),
+    ('Result3 - Battery Statistics', 'Values'),
+    ('Maximum Battery Cost', '{max_battery}'),
+    ('Minimum Battery Cost', '{min_battery}'),
+    ('Average Battery Cost', '{avg_battery}'),
+)
+
+def _build_sheet_template() -> str:
+    """
+    Pre-render the worksheet for _LAYOUT, leaving str.format slots for the values
+    
+    Labels and the ISN are inline strings, so no shared-strings part is
+    needed; the other slots are numeric cells.
+    """
+    row_parts = []
+    for r, row in enumerate(_LAYOUT, start=1):
+        cells = []
+        for col, value in zip('AB', row):
+            ref = f'{col}{r}'
+            if value == '{isn}':
+                cells.append(f'<c r="{ref}" t="inlineStr"><is><t>{{isn}}</t></is></c>')
+            elif value.startswith('{'):
+                cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+            else:
+                cells.append(f'<c r="{ref}" t="inlineStr"><is><t>{escape(value)}</t></is></c>')
+        if cells:
+            row_parts.append(f'<row r="{r}">{"".join(cells)}</row>')
+    return (_XML_DECL + f'<worksheet xmlns="{_MAIN_NS}"><sheetData>' + 
+            ''.join(row_parts) + '</sheetData></worksheet>')
+
+_SHEET_TEMPLATE = _build_sheet_template()
+
+def _number(value: float) -> str:
+    """
+    Format a value for a numeric <v> cell
+    
+    Raises:
+        ValueError: If the value is NaN or infinite, which the format cannot hold
+    """
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"Cannot write non-finite value {value!r} to Excel")
+    return repr(value)
+
+def _write(path: str, isn: str, maxc: float, minc: float, avgc: float, 
+           maxb: float, minb: float, avgb: float):
+    """Write the report to path by filling the pre-rendered sheet template"""
+    sheet = _SHEET_TEMPLATE.format(
+        isn=escape(str(isn)),
+        max_cost=_number(maxc), min_cost=_number(minc), avg_cost=_number(avgc),
+        max_battery=_number(maxb), min_battery=_number(minb), avg_battery=_number(avgb)
+    )
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as xlsx:
+        for part, xml in _XLSX_TEMPLATE.items():
+            xlsx.writestr(part, xml)
+        xlsx.writestr('xl/worksheets/sheet1.xml', sheet)
 
 class ExcelWriter:
     """Handles writing results to Excel file"""
@@ -20,36 +141,15 @@ class ExcelWriter:
         filepath = os.path.join(self.output_dir, filename)
         
         try:
-            self.logger.info(f"Writing results to {filepath}")
-            
-            # Create DataFrames for each result
-            result1_df = pd.DataFrame({
-                'Result1 - Max Cost ISN': [max_isn]
-            })
-            
-            result2_df = pd.DataFrame({
-                'Result2 - Cost Statistics': ['Maximum Cost', 'Minimum Cost', 'Average Cost'],
-                'Values': [cost_stats['max_cost'], cost_stats['min_cost'], cost_stats['avg_cost']]
-            })
-            
-            result3_df = pd.DataFrame({
-                'Result3 - Battery Statistics': ['Maximum Battery Cost', 'Minimum Battery Cost', 'Average Battery Cost'],
-                'Values': [battery_stats['max_battery'], battery_stats['min_battery'], battery_stats['avg_battery']]
-            })
+            self.logger.info("Writing results to %s", filepath)
             
-            # Write all results to Excel using openpyxl
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                # Write Result1 at the top
-                result1_df.to_excel(writer, sheet_name='Results', index=False, startrow=0)
-                
-                # Write Result2 below Result1 (leaving one row gap)
-                result2_df.to_excel(writer, sheet_name='Results', index=False, startrow=3)
-                
-                # Write Result3 below Result2 (leaving one row gap)
-                result3_df.to_excel(writer, sheet_name='Results', index=False, startrow=8)
+            _write(filepath, max_isn,
+                   cost_stats['max_cost'], cost_stats['min_cost'], cost_stats['avg_cost'],
+                   battery_stats['max_battery'], battery_stats['min_battery'], 
+                   battery_stats['avg_battery'])
             
-            self.logger.info(f"Results successfully written to {filepath}")
+            self.logger.info("Results successfully written to %s", filepath)
             
         except Exception as e:
-            self.logger.error(f"Error writing results to Excel: {str(e)}")
+            self.logger.error("Error writing results to Excel: %s", e)
             raise
\ No newline at end of file
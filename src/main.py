@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from data_loader import DataLoader
 from data_processor import DataProcessor
 from excel_writer import ExcelWriter
@@ -21,16 +22,16 @@ def main():
         processor = DataProcessor()
         writer = ExcelWriter()
         
-        # Load data
+        # Load data, both files in parallel (the CSV parsers release the GIL)
         logger.info("Loading input files...")
-        pc_df = loader.load_csv('PC.csv')
-        nb_df = loader.load_csv('NB.csv')
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pc_future = executor.submit(loader.load_csv, 'PC.csv')
+            nb_future = executor.submit(loader.load_csv, 'NB.csv')
+            pc_table, nb_table = pc_future.result(), nb_future.result()
         
         # Process data
         logger.info("Processing data...")
-        max_isn = processor.get_max_cost_isn(pc_df, nb_df)
-        cost_stats = processor.calculate_cost_stats(pc_df, nb_df)
-        battery_stats = processor.calculate_battery_stats(nb_df)
+        max_isn, cost_stats, battery_stats = processor.compute_all(pc_table, nb_table)
         
         # Write results
         logger.info("Writing results...")
@@ -39,7 +40,7 @@ def main():
         logger.info("ETL process completed successfully")
         
     except Exception as e:
-        logger.error(f"ETL process failed: {str(e)}")
+        logger.error("ETL process failed: %s", e)
         raise
 
 if __name__ == "__main__":
@@ -1,13 +1,17 @@
 from typing import Dict, List, Any, Union, Optional
 import unittest
 import functools
-from unittest.mock import patch, mock_open, MagicMock
+import importlib.util
+from unittest.mock import patch, MagicMock
 import pandas as pd
 import numpy as np
-from src.data_loader import DataLoader
+import openpyxl
+from src.data_loader import DataLoader, ProductTable
+from src import data_processor
 from src.data_processor import DataProcessor
 from src.excel_writer import ExcelWriter
 import os
+import tempfile
 
 def print_test_result(func: Any) -> Any:
     """Decorator to print test results"""
@@ -63,11 +67,12 @@ class TestDataLoader(unittest.TestCase):
         mock_read_csv.return_value = mock_df
         
         result = self.loader.load_csv('PC.csv')
-        self.assertIsInstance(result, pd.DataFrame)
-        self.assertEqual(list(result.columns), [
-            'Product Type', 'ISN', 'Defective', 'CPU Cost', 
-            'Network Card Cost', 'Total Cost'
-        ])
+        self.assertIsInstance(result, ProductTable)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result.isn.tolist(), ['PC1', 'PC2'])
+        self.assertEqual(result.defective.tolist(), [True, False])
+        self.assertEqual(result.total_cost.tolist(), [150, 260])
+        self.assertIsNone(result.battery_cost)
         
     @print_test_result
     @patch('pandas.read_csv')
@@ -86,6 +91,46 @@ class TestDataLoader(unittest.TestCase):
     def test_load_csv_file_not_found(self) -> None:
         with self.assertRaises(FileNotFoundError):
             self.loader.load_csv('nonexistent.csv')
+
+    @print_test_result
+    def test_load_csv_dtypes(self) -> None:
+        """Test columns are parsed with the declared types"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, 'PC.csv'), 'w') as f:
+                f.write('Product Type,ISN,Defective ,CPU Cost,Network Card Cost,Total Cost,Note\n'
+                        'PC,PC1,FALSE,200,50,250,a\n'
+                        'PC,PC2,TRUE,300,60,360,b\n')
+            result = DataLoader(input_dir=tmp_dir).load_csv('PC.csv')
+            
+        self.assertEqual(result.defective.dtype, bool)
+        self.assertEqual(result.total_cost.dtype, np.float32)
+        self.assertEqual(result.isn.tolist(), ['PC1', 'PC2'])
+        
+    @print_test_result
+    def test_load_csv_streaming(self) -> None:
+        """Test chunked loading drops defective rows"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, 'PC.csv'), 'w') as f:
+                f.write('Product Type,ISN,Defective ,CPU Cost,Network Card Cost,Total Cost\n'
+                        'PC,PC1,FALSE,200,50,250\n'
+                        'PC,PC2,TRUE,300,60,360\n'
+                        'PC,PC3,FALSE,400,70,470\n')
+            loader = DataLoader(input_dir=tmp_dir)
+            chunks = list(loader.load_csv_streaming('PC.csv', chunksize=2))
+            
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual([isn for chunk in chunks for isn in chunk.isn], ['PC1', 'PC3'])
+        self.assertFalse(any(chunk.defective.any() for chunk in chunks))
+        
+    @print_test_result
+    def test_load_csv_streaming_header_only(self) -> None:
+        """Test streaming a header-only file raises like load_csv"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, 'PC.csv'), 'w') as f:
+                f.write('Product Type,ISN,Defective ,CPU Cost,Network Card Cost,Total Cost\n')
+            loader = DataLoader(input_dir=tmp_dir)
+            with self.assertRaises(pd.errors.EmptyDataError):
+                list(loader.load_csv_streaming('PC.csv'))
             
 class TestDataProcessor(unittest.TestCase):
     def setUp(self) -> None:
@@ -116,6 +161,37 @@ class TestDataProcessor(unittest.TestCase):
         result = self.processor.get_max_cost_isn(self.pc_data, self.nb_data)
         self.assertEqual(result, 'NB2')
         
+    @print_test_result
+    def test_product_table_input(self) -> None:
+        """Test the processor accepts columnar ProductTables"""
+        pc_table = ProductTable.from_frame(self.pc_data)
+        nb_table = ProductTable.from_frame(self.nb_data)
+        
+        self.assertEqual(self.processor.get_max_cost_isn(pc_table, nb_table), 'NB2')
+        self.assertEqual(self.processor.compute_all(pc_table, nb_table), 
+                         self.processor.compute_all(self.pc_data, self.nb_data))
+        with self.assertRaises(ValueError) as context:
+            self.processor.calculate_battery_stats(pc_table)
+        self.assertIn('Battery Cost column not found', str(context.exception))
+        
+    @print_test_result
+    def test_get_max_cost_isn_tie(self) -> None:
+        """Test ties resolve to the first item, PC before NB"""
+        nb_tie = self.nb_data.copy()
+        nb_tie.loc[1, 'Total Cost'] = 470
+        result = self.processor.get_max_cost_isn(self.pc_data, nb_tie)
+        self.assertEqual(result, 'PC3')
+        
+    @print_test_result
+    def test_get_max_cost_isn_blank_cost(self) -> None:
+        """Test a blank (NaN) total cost is never picked as the maximum"""
+        pc = self.pc_data.copy()
+        pc['Defective'] = False
+        pc['Total Cost'] = [np.nan, 360.0, 100.0]
+        nb = self.nb_data.iloc[:1].copy()
+        nb['Total Cost'] = [300.0]
+        self.assertEqual(self.processor.get_max_cost_isn(pc, nb), 'PC2')
+        
     @print_test_result
     def test_get_max_cost_isn_all_defective(self) -> None:
         pc_all_defective = self.pc_data.copy()
@@ -139,6 +215,104 @@ class TestDataProcessor(unittest.TestCase):
         self.assertEqual(stats['max_cost'], 590.0)  # NB2
         self.assertEqual(stats['min_cost'], 250.0)  # PC1
         
+    @print_test_result
+    def test_blank_costs_skipped(self) -> None:
+        """Test blank (NaN) cost cells are left out of the statistics"""
+        pc = pd.DataFrame({
+            'ISN': ['PC1', 'PC2', 'PC3'],
+            'Defective': [False, False, False],
+            'Total Cost': [np.nan, 360.0, 100.0]
+        })
+        nb = pd.DataFrame({
+            'ISN': ['NB1', 'NB2'],
+            'Defective': [False, False],
+            'Battery Cost': [np.nan, 120.0],
+            'Total Cost': [300.0, np.nan]
+        })
+        
+        expected_cost = {'max_cost': 360.0, 'min_cost': 100.0, 'avg_cost': 253.33}
+        expected_battery = {'max_battery': 120.0, 'min_battery': 120.0, 'avg_battery': 120.0}
+        self.assertEqual(self.processor.calculate_cost_stats(pc, nb), expected_cost)
+        self.assertEqual(self.processor.calculate_battery_stats(nb), expected_battery)
+        
+        self.assertEqual(self.processor.process_stream([pc], [nb]), 
+                         ('PC2', expected_cost, expected_battery))
+        
+    @print_test_result
+    def test_caller_frame_costs_exact(self) -> None:
+        """Test caller frames keep their dtype and max/min are not rounded"""
+        pc = self.pc_data.copy()
+        pc['Total Cost'] = [16_777_217, 1.0, 0.001]
+        nb = self.nb_data.copy()
+        nb['Total Cost'] = [1234.56, 200000.01, 99.99]
+        nb['Battery Cost'] = [100.25, 120.75, 140.5]
+        
+        self.assertEqual(ProductTable.from_frame(pc).total_cost.dtype, np.float64)
+        stats = self.processor.calculate_cost_stats(pc, nb)
+        self.assertEqual(stats['max_cost'], 16_777_217.0)
+        self.assertEqual(stats['min_cost'], 0.001)
+        self.assertEqual(self.processor.compute_all(pc, nb)[1], stats)
+        
+        battery = self.processor.calculate_battery_stats(nb)
+        self.assertEqual(battery, {'max_battery': 120.75, 'min_battery': 100.25, 'avg_battery': 110.5})
+        
+        pc['Defective'] = True
+        self.assertEqual(self.processor.calculate_cost_stats(pc, nb)['max_cost'], 200000.01)
+        
+    @print_test_result
+    def test_csv_costs_float32(self) -> None:
+        """Test CSV costs are float32: 2-decimal values read back as written, integers exact up to 2**24"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, 'NB.csv'), 'w') as f:
+                f.write('Product Type,ISN,Defective ,CPU Cost,Network Card Cost,Battery Cost,Total Cost\n'
+                        'NB,NB1,FALSE,300,60,100.25,1234.56\n'
+                        'NB,NB2,FALSE,400,70,120.75,0.01\n'
+                        'NB,NB3,FALSE,500,80,140.5,16777216\n')
+            nb = DataLoader(input_dir=tmp_dir).load_csv('NB.csv')
+            
+        pc = ProductTable.from_frame(self.pc_data.iloc[:0])
+        stats = self.processor.calculate_cost_stats(pc, nb)
+        self.assertEqual(stats, {'max_cost': 16777216.0, 'min_cost': 0.01, 'avg_cost': 5592816.86})
+        battery = self.processor.calculate_battery_stats(nb)
+        self.assertEqual(battery, {'max_battery': 140.5, 'min_battery': 100.25, 'avg_battery': 120.5})
+        
+        # Above 2**24 float32 no longer holds every integer
+        self.assertEqual(float(np.float32(16_777_217)), 16_777_216.0)
+        
+    @print_test_result
+    def test_calculate_cost_stats_large_input(self) -> None:
+        """Test the single-pass reduction agrees with pandas on a large input, for each backend"""
+        rng = np.random.default_rng(1)
+        n = 200_000
+        pc = pd.DataFrame({
+            'ISN': [f'PC{i}' for i in range(n)],
+            'Defective': rng.random(n) < 0.2,
+            'Total Cost': rng.integers(1000, 20000, n)
+        })
+        valid = pc.loc[~pc['Defective'], 'Total Cost']
+        expected = {
+            'max_cost': float(valid.max()),
+            'min_cost': float(valid.min()),
+            'avg_cost': round(float(valid.mean()), 2)
+        }
+        
+        processors = {'numpy': self.processor}
+        if importlib.util.find_spec('numba') is not None:
+            processors['numba'] = DataProcessor(use_numba=True)
+        for backend, processor in processors.items():
+            # Numba is only used from _JIT_MIN_SIZE rows, lowered so this input reaches it
+            with self.subTest(backend=backend), patch.object(data_processor, '_JIT_MIN_SIZE', 1):
+                self.assertEqual(processor.calculate_cost_stats(pc, pc.iloc[:0]), expected)
+        
+    @print_test_result
+    def test_calculate_cost_stats_one_frame_defective(self) -> None:
+        """Test cost statistics when only one of the frames has valid items"""
+        pc_all_defective = self.pc_data.copy()
+        pc_all_defective['Defective'] = True
+        stats = self.processor.calculate_cost_stats(pc_all_defective, self.nb_data)
+        
+        self.assertEqual(stats, {'max_cost': 590.0, 'min_cost': 460.0, 'avg_cost': 525.0})
+        
     @print_test_result
     def test_calculate_cost_stats_empty_data(self) -> None:
         """Test cost statistics calculation with empty data"""
@@ -162,6 +336,77 @@ class TestDataProcessor(unittest.TestCase):
         with self.assertRaises(Exception):
             self.processor.calculate_cost_stats(invalid_df, invalid_df)
         
+    @print_test_result
+    def test_frame_edited_in_place(self) -> None:
+        """Test in-place edits to a DataFrame are seen by the next call"""
+        self.assertEqual(self.processor.calculate_cost_stats(self.pc_data, self.nb_data)['min_cost'], 
+                         250.0)
+        
+        self.pc_data.loc[1, 'Total Cost'] = 900
+        self.pc_data.loc[0, 'Defective'] = True
+        stats = self.processor.calculate_cost_stats(self.pc_data, self.nb_data)
+        self.assertEqual((stats['max_cost'], stats['min_cost']), (590.0, 460.0))
+        
+        self.pc_data.loc[1, 'Defective'] = False
+        self.assertEqual(self.processor.calculate_cost_stats(self.pc_data, self.nb_data)['max_cost'], 
+                         900.0)
+        
+    @print_test_result
+    def test_compute_all(self) -> None:
+        """Test combined computation matches the individual methods"""
+        max_isn, cost_stats, battery_stats = self.processor.compute_all(self.pc_data, self.nb_data)
+        
+        self.assertEqual(max_isn, 'NB2')
+        self.assertEqual(cost_stats, self.processor.calculate_cost_stats(self.pc_data, self.nb_data))
+        self.assertEqual(battery_stats, self.processor.calculate_battery_stats(self.nb_data))
+        
+    @print_test_result
+    def test_compute_all_all_defective(self) -> None:
+        pc_all_defective = self.pc_data.copy()
+        pc_all_defective['Defective'] = True
+        nb_all_defective = self.nb_data.copy()
+        nb_all_defective['Defective'] = True
+        
+        with self.assertRaises(ValueError) as context:
+            self.processor.compute_all(pc_all_defective, nb_all_defective)
+        self.assertIn('No valid (non-defective) items found', str(context.exception))
+        
+    @unittest.skipIf(importlib.util.find_spec('numba') is None, "numba not installed")
+    @print_test_result
+    def test_masked_stats_jit(self) -> None:
+        """Test the Numba kernel agrees with the NumPy reduction"""
+        rng = np.random.default_rng(0)
+        cost = rng.integers(0, 1000, 10_000).astype(np.float64)
+        defective = rng.random(10_000) < 0.3
+        cost[::97] = np.nan
+        
+        expected = data_processor._masked_stats_numpy(cost, defective)
+        kernel = data_processor._load_jit_kernel()
+        result = kernel(cost, defective)
+        self.assertEqual(result[0], expected[0])
+        np.testing.assert_allclose(result[1:], expected[1:])
+        
+        # End to end on float32 input, as load_csv produces
+        pc = ProductTable(np.zeros(3, bool), np.array([0.01, 1234.56, 5.5], np.float32), 
+                          np.array(['PC1', 'PC2', 'PC3'], object))
+        nb = ProductTable(np.zeros(1, bool), np.array([99.99], np.float32), 
+                          np.array(['NB1'], object), np.array([120.75], np.float32))
+        with patch.object(data_processor, '_JIT_MIN_SIZE', 1):
+            results = DataProcessor(use_numba=True).compute_all(pc, nb)
+        self.assertEqual(results, DataProcessor().compute_all(pc, nb))
+        self.assertEqual(results[1], {'max_cost': 1234.56, 'min_cost': 0.01, 'avg_cost': 335.02})
+        
+    @print_test_result
+    def test_process_stream(self) -> None:
+        """Test chunked processing matches the in-memory results"""
+        pc_chunks = [self.pc_data.iloc[:2], self.pc_data.iloc[2:]]
+        nb_chunks = [self.nb_data.iloc[:1], self.nb_data.iloc[1:]]
+        max_isn, cost_stats, battery_stats = self.processor.process_stream(pc_chunks, nb_chunks)
+        
+        self.assertEqual(max_isn, 'NB2')
+        self.assertEqual(cost_stats, self.processor.calculate_cost_stats(self.pc_data, self.nb_data))
+        self.assertEqual(battery_stats, self.processor.calculate_battery_stats(self.nb_data))
+        
     @print_test_result
     def test_calculate_battery_stats(self) -> None:
         stats = self.processor.calculate_battery_stats(self.nb_data)
@@ -182,6 +427,15 @@ class TestDataProcessor(unittest.TestCase):
             self.processor.calculate_battery_stats(invalid_df)
         self.assertIn('Battery Cost column not found', str(context.exception))
         
+    @print_test_result
+    def test_calculate_battery_stats_battery_columns_only(self) -> None:
+        """Test battery statistics only need the Defective and Battery Cost columns"""
+        nb = pd.DataFrame({'Defective': [False, True], 'Battery Cost': [1.0, 5.0]})
+        self.assertEqual(self.processor.calculate_battery_stats(nb), 
+                         {'max_battery': 1.0, 'min_battery': 1.0, 'avg_battery': 1.0})
+        with self.assertRaises(KeyError):
+            self.processor.calculate_battery_stats(nb[['Battery Cost']])
+        
     @print_test_result
     def test_calculate_battery_stats_empty_data(self) -> None:
         """Test battery statistics calculation with empty data"""
@@ -232,32 +486,57 @@ class TestExcelWriter(unittest.TestCase):
     @print_test_result
     def test_write_results(self) -> None:
         filename = 'test_result.xlsx'
-        filepath = os.path.join(self.writer.output_dir, filename)
 
-        m = mock_open()
-        with patch('builtins.open', m), \
-             patch('pandas.ExcelWriter') as mock_excel_writer, \
-             patch('pandas.DataFrame.to_excel') as mock_to_excel:
-            
-            self.writer.write_results(
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            writer = ExcelWriter(output_dir=tmp_dir)
+            writer.write_results(
                 filename,
                 self.test_data['max_isn'],
                 self.test_data['cost_stats'],
                 self.test_data['battery_stats']
             )
 
-            mock_excel_writer.assert_called_once_with(
-                filepath,
-                engine='openpyxl'
-            )
+            wb = openpyxl.load_workbook(os.path.join(tmp_dir, filename))
+            self.assertEqual(wb.sheetnames, ['Results'])
+            ws = wb['Results']
+            rows = [[cell for cell in row if cell is not None] 
+                    for row in ws.iter_rows(values_only=True)]
+            wb.close()
 
-            self.assertEqual(mock_to_excel.call_count, 3)
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(rows[0], ['Result1 - Max Cost ISN'])
+        self.assertEqual(rows[1], ['PC1'])
+        self.assertEqual(rows[2], [])
+        self.assertEqual(rows[3], ['Result2 - Cost Statistics', 'Values'])
+        self.assertEqual(rows[4], ['Maximum Cost', 1000.0])
+        self.assertEqual(rows[6], ['Average Cost', 750.0])
+        self.assertEqual(rows[8], ['Result3 - Battery Statistics', 'Values'])
+        self.assertEqual(rows[11], ['Average Battery Cost', 150.0])
+
+    @print_test_result
+    def test_write_results_escapes_isn(self) -> None:
+        """Test XML special characters in the ISN survive the round trip"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            writer = ExcelWriter(output_dir=tmp_dir)
+            writer.write_results('test_result.xlsx', 'PC<1>&2',
+                                 self.test_data['cost_stats'],
+                                 self.test_data['battery_stats'])
             
-            calls = mock_to_excel.call_args_list
-            self.assertEqual(calls[0][1]['sheet_name'], 'Results')
-            self.assertEqual(calls[0][1]['startrow'], 0)
-            self.assertEqual(calls[1][1]['startrow'], 3)
-            self.assertEqual(calls[2][1]['startrow'], 8)
+            wb = openpyxl.load_workbook(os.path.join(tmp_dir, 'test_result.xlsx'))
+            self.assertEqual(wb['Results']['A2'].value, 'PC<1>&2')
+            wb.close()
+
+    @print_test_result
+    def test_write_results_non_finite(self) -> None:
+        """Test NaN/inf statistics are rejected instead of written as invalid XML"""
+        battery_stats = dict(self.test_data['battery_stats'], avg_battery=float('nan'))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            writer = ExcelWriter(output_dir=tmp_dir)
+            with self.assertRaises(ValueError) as context:
+                writer.write_results('test_result.xlsx', self.test_data['max_isn'],
+                                     self.test_data['cost_stats'], battery_stats)
+            self.assertIn('non-finite', str(context.exception))
+            self.assertFalse(os.path.exists(os.path.join(tmp_dir, 'test_result.xlsx')))
 
 if __name__ == '__main__':
     print("Starting ETL Unit Tests...")